@@ -6,6 +6,14 @@ from dotmagic.config import Config
 config = Config(default=".env.sample")
 
 DEBUG = "--debug" in sys.argv or config.DEBUG.lower() == "true"
+PROFILE_MEMORY = (
+    "--profile-memory" in sys.argv or (config.PROFILE_MEMORY or "").lower() == "true"
+)
+PROFILE = (
+    PROFILE_MEMORY
+    or "--profile" in sys.argv
+    or (config.PROFILE or "").lower() == "true"
+)
 
 logging.basicConfig(
     level=logging.DEBUG if DEBUG else logging.INFO,
@@ -1,6 +1,8 @@
 import logging
 
+from . import PROFILE, PROFILE_MEMORY, config
 from .handler import Handler
+from .profiler import Profiler
 from .worker import WorkerManager
 
 log = logging.getLogger(__name__)
@@ -8,11 +10,35 @@ log = logging.getLogger(__name__)
 
 handler = Handler()
 
+profiler = None
+if PROFILE:
+    profiler = Profiler(
+        output_dir=config.PROFILE_DIR or "profile", trace_memory=PROFILE_MEMORY
+    )
+    profiler.wrap_lock(handler.entries_manager.database, "ThreadSafePickleDB._lock")
+    if handler.seedr:
+        profiler.wrap_lock(handler.seedr, "Seedrcc._lock")
+
 worker = WorkerManager(
     get_entries=handler.feed,
     handle_entry=handler.handle,
     entries_manager=handler.entries_manager,
+    profiler=profiler,
 )
 
 if __name__ == "__main__":
-    worker.check_new_entries()
+    if profiler:
+        profiler.start()
+    try:
+        worker.check_new_entries()
+    finally:
+        if handler.seedr:
+            stats = handler.seedr.get_api_stats()
+            log.info(
+                f"Seedr API calls: {stats['total']} "
+                f"(cache hits: {stats['cache_hits']})"
+            )
+            log.debug(f"Seedr API calls by method: {stats['calls']}")
+        if profiler:
+            profiler.stop()
+            profiler.report()
@@ -14,6 +14,14 @@ from .seedr import Seedrcc
 log = logging.getLogger(__name__)
 
 
+def duration(value, default):
+    if value is None or value == "":
+        value = default
+    if isinstance(value, int) or value.isdigit():
+        return int(value)
+    return seconds(value)
+
+
 class Handler:
     def __init__(self):
         self.rss_url = config.required.RSS_URL
@@ -31,8 +39,15 @@ class Handler:
 
         self.seedr = None
         if config.SEEDRCC_EMAIL and config.SEEDRCC_PASSWORD:
+            cache_ttl = duration(config.SEEDRCC_CACHE_TTL, "5s")
+            poll_interval = duration(config.SEEDRCC_POLL_INTERVAL, "5s")
             try:
-                self.seedr = Seedrcc(config.SEEDRCC_EMAIL, config.SEEDRCC_PASSWORD)
+                self.seedr = Seedrcc(
+                    config.SEEDRCC_EMAIL,
+                    config.SEEDRCC_PASSWORD,
+                    cache_ttl=cache_ttl,
+                    poll_interval=poll_interval,
+                )
                 self.seedr.delete_all()
             except Exception as err:
                 log.error(f"Seedrcc login failed: {err}")
@@ -0,0 +1,242 @@
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter, thread_time
+
+log = logging.getLogger(__name__)
+
+
+class TimedLock:
+    def __init__(self, lock, name, profiler):
+        self._inner = lock
+        self.name = name
+        self.profiler = profiler
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._inner.acquire(False):
+            return True
+        if not blocking:
+            return False
+        start = perf_counter()
+        acquired = self._inner.acquire(True, timeout)
+        self.profiler.add_lock_wait(self.name, perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._inner.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+class Profiler:
+    def __init__(
+        self,
+        output_dir="profile",
+        interval=0.01,
+        trace_memory=False,
+        traceback_limit=1,
+    ):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.traceback_limit = traceback_limit
+        self.stacks = Counter()
+        self.tasks = {}
+        self.lock_waits = defaultdict(lambda: [0, 0.0])
+        self._labels = {}
+        self._code_names = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._elapsed = 0.0
+        self._peak_memory = 0
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start(self.traceback_limit)
+        self._started_at = perf_counter()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        log.info(f"Profiling enabled, writing reports to {self.output_dir}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._elapsed = perf_counter() - self._started_at
+
+    def wrap_lock(self, obj, name, attr="_lock"):
+        setattr(obj, attr, TimedLock(getattr(obj, attr), name, self))
+
+    def add_lock_wait(self, name, wait):
+        label = self._labels.get(threading.get_ident())
+        with self._lock:
+            self.lock_waits[name][0] += 1
+            self.lock_waits[name][1] += wait
+            if label in self.tasks:
+                self.tasks[label]["lock_wait"] += wait
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+
+    def _reset_peak(self):
+        self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def task(self, label, exclusive=False):
+        ident = threading.get_ident()
+        stats = dict(wall=0.0, cpu=0.0, lock_wait=0.0, samples=0, frames=Counter())
+        with self._lock:
+            self.tasks[label] = stats
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if exclusive:
+                self._reset_peak()
+            snapshot = self._snapshot()
+            memory = tracemalloc.get_traced_memory()[0]
+        self._labels[ident] = label
+        wall, cpu = perf_counter(), thread_time()
+        try:
+            yield
+        finally:
+            stats["wall"] = perf_counter() - wall
+            stats["cpu"] = thread_time() - cpu
+            self._labels.pop(ident, None)
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                stats["memory"] = current - memory
+                if exclusive:
+                    stats["peak"] = peak - memory
+                allocators = self._snapshot().compare_to(snapshot, "lineno")
+                stats["allocators"] = allocators[:5]
+
+    def _frame_name(self, code):
+        name = self._code_names.get(code)
+        if name is None:
+            filename = os.path.basename(code.co_filename)
+            name = self._code_names[code] = f"{filename}:{code.co_name}"
+        return name
+
+    def _sample(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                label = self._labels.get(ident)
+                if ident == own_ident or label is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame.f_code))
+                    frame = frame.f_back
+                collapsed = ";".join(reversed(stack))
+                with self._lock:
+                    self.stacks[collapsed] += 1
+                    if label in self.tasks:
+                        self.tasks[label]["samples"] += 1
+                        self.tasks[label]["frames"][stack[0]] += 1
+
+    def report(self, top=15):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if tracemalloc.is_tracing():
+            self._reset_peak()
+            tracemalloc.stop()
+
+        with self._lock:
+            stacks = Counter(self.stacks)
+            tasks = {
+                label: dict(stats, frames=Counter(stats["frames"]))
+                for label, stats in self.tasks.items()
+            }
+            lock_waits = {name: tuple(wait) for name, wait in self.lock_waits.items()}
+
+        stacks_path = os.path.join(self.output_dir, "stacks.collapsed")
+        with open(stacks_path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self_samples = Counter()
+        for stack, count in stacks.items():
+            self_samples[stack.rsplit(";", 1)[-1]] += count
+
+        lines = [
+            f"Stacks are wall-clock samples taken every {self.interval * 1000:g}ms: "
+            "time blocked on I/O, subprocesses, sleeps and locks is included.",
+            "",
+            "Tasks",
+            "-----",
+        ]
+        for label, stats in tasks.items():
+            hotspot = ", ".join(
+                f"{name} ({count})" for name, count in stats["frames"].most_common(3)
+            )
+            line = (
+                f"{label}: wall={stats['wall']:.2f}s cpu={stats['cpu']:.2f}s "
+                f"lock_wait={stats['lock_wait']:.3f}s "
+            )
+            if "peak" in stats:
+                line += (
+                    f"memory={stats['memory'] / 1024:+.1f}KiB "
+                    f"peak={stats['peak'] / 1024:+.1f}KiB "
+                )
+            elif "memory" in stats:
+                line += f"process_memory={stats['memory'] / 1024:+.1f}KiB "
+            line += f"wall_samples={stats['samples']} hotspots=[{hotspot}]"
+            lines.append(line)
+
+        total_cpu = sum(stats["cpu"] for stats in tasks.values())
+        aggregate = (
+            f"tasks={len(tasks)} elapsed={self._elapsed:.2f}s "
+            f"cpu={total_cpu:.2f}s wall_samples={sum(stacks.values())}"
+        )
+        if self.trace_memory:
+            aggregate += f" peak_memory={self._peak_memory / 1024 / 1024:.1f}MiB"
+        lines += [
+            "",
+            "Aggregate",
+            "---------",
+            aggregate,
+            "",
+            "Top frames (wall-clock self samples)",
+            "------------------------------------",
+        ]
+        lines += [f"{count:8d} {name}" for name, count in self_samples.most_common(top)]
+
+        lines += ["", "Lock wait", "---------"]
+        for name, (count, wait) in lock_waits.items():
+            lines.append(f"{name}: contended={count} wait={wait:.3f}s")
+
+        if self.trace_memory:
+            lines += [
+                "",
+                "Top allocators by task",
+                "----------------------",
+                "Memory still held when each task finished. Tasks without a peak "
+                "ran concurrently, so their figures are process-wide.",
+            ]
+            for label, stats in tasks.items():
+                if "allocators" not in stats:
+                    continue
+                lines += ["", f"{label}:"]
+                lines += [f"  {stat}" for stat in stats["allocators"]]
+
+        report_path = os.path.join(self.output_dir, "report.txt")
+        with open(report_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        log.info(f"Profile report written to {report_path} and {stacks_path}")
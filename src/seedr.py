@@ -1,7 +1,9 @@
 import logging
 import os
 import threading
-from time import time
+from collections import Counter
+from concurrent.futures import Future
+from time import sleep, time
 
 from seedrcc import Login, Seedr
 
@@ -35,11 +37,12 @@ class Torrent:
 
     @property
     def status(self):
-        for torrent in self.contents["torrents"]:
+        contents = self.contents
+        for torrent in contents["torrents"]:
             if torrent["id"] == self.torrent_id:
                 return torrent["progress"]
 
-        for folder in self.contents["folders"]:
+        for folder in contents["folders"]:
             if folder["name"] == self.name and folder["size"] == self.size:
                 self.folder_id = folder["id"]
                 return "finished"
@@ -64,11 +67,123 @@ class Torrent:
         return file_links
 
 
-class Seedrcc(Seedr):
-    def __init__(self, username, password):
+class CachedSeedr(Seedr):
+    def __init__(self, token, callbackFunc=None, cache_ttl=5):
+        super().__init__(token=token, callbackFunc=callbackFunc)
+        self.cache_ttl = cache_ttl
+        self.api_calls = Counter()
+        self.cache_hits = 0
+        self._cache = {}
+        self._inflight = {}
+        self._generation = 0
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _count(self, name):
+        with self._cache_lock:
+            self.api_calls[name] += 1
+
+    def _call(self, name, func, *args, **kwargs):
+        self._count(name)
+        self._local.method = name
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._local.method = None
+
+    def refreshToken(self):
+        self._count("refreshToken")
+        response = super().refreshToken()
+        method = getattr(self._local, "method", None)
+        if method and "error" not in response:
+            # seedrcc retries the expired call once the token is refreshed
+            self._count(method)
+        return response
+
+    def invalidate(self):
+        with self._cache_lock:
+            self._generation += 1
+            self._cache.clear()
+            self._inflight.clear()
+
+    def listContents(self, folderId=0, contentType="folder"):
+        key = (str(folderId), contentType)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time():
+                self.cache_hits += 1
+                return cached[1]
+
+            future = self._inflight.get(key)
+            if future:
+                self.cache_hits += 1
+                is_leader = False
+            else:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+                is_leader = True
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            contents = self._call(
+                "listContents", super().listContents, folderId, contentType
+            )
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        finally:
+            with self._cache_lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+        with self._cache_lock:
+            if generation == self._generation and "error" not in contents:
+                self._cache[key] = (time() + self.cache_ttl, contents)
+        future.set_result(contents)
+        return contents
+
+    def addTorrent(self, *args, **kwargs):
+        try:
+            return self._call("addTorrent", super().addTorrent, *args, **kwargs)
+        finally:
+            self.invalidate()
+
+    def deleteFolder(self, folderId):
+        try:
+            return self._call("deleteFolder", super().deleteFolder, folderId)
+        finally:
+            self.invalidate()
+
+    def deleteTorrent(self, torrentId):
+        try:
+            return self._call("deleteTorrent", super().deleteTorrent, torrentId)
+        finally:
+            self.invalidate()
+
+    def deleteFile(self, fileId):
+        try:
+            return self._call("deleteFile", super().deleteFile, fileId)
+        finally:
+            self.invalidate()
+
+    def fetchFile(self, fileId):
+        return self._call("fetchFile", super().fetchFile, fileId)
+
+    def get_api_stats(self):
+        with self._cache_lock:
+            calls = dict(self.api_calls)
+            hits = self.cache_hits
+        return dict(total=sum(calls.values()), cache_hits=hits, calls=calls)
+
+
+class Seedrcc(CachedSeedr):
+    def __init__(self, username, password, cache_ttl=5, poll_interval=5):
         self._lock = threading.Lock()
+        self.poll_interval = poll_interval
         self.__token = self.__create_new_token(username=username, password=password)
-        super().__init__(token=self.__token)
+        super().__init__(token=self.__token, cache_ttl=cache_ttl)
 
     def __create_new_token(self, username, password):
         log.debug("Login to seedr using username and password")
@@ -102,17 +217,19 @@ class Seedrcc(Seedr):
 
     def wait_for_torrents(self, torrent: Torrent, timeout: int) -> Torrent:
         now = time()
-        while torrent.status != "finished" and torrent.status != "deleted":
+        while torrent.status not in ("finished", "deleted"):
             if time() - now > timeout:
                 raise TimeoutError("Timeout while waiting for torrent to finish")
+            sleep(max(self.poll_interval, self.cache_ttl))
         return torrent
 
     def delete_all(self):
-        for torrent in self.contents["torrents"]:
+        contents = self.contents
+        for torrent in contents["torrents"]:
             self.deleteTorrent(torrent["id"])
 
-        for folder in self.contents["folders"]:
+        for folder in contents["folders"]:
             self.deleteFolder(folder["id"])
 
-        for file in self.contents["files"]:
+        for file in contents["files"]:
             self.deleteFile(file["id"])
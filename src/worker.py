@@ -1,12 +1,14 @@
 import logging
+from contextlib import nullcontext
 from queue import LifoQueue
 from threading import Lock, Thread
 from traceback import format_exc
-from typing import Union
+from typing import Optional, Union
 
 from src import DEBUG, config
 
 from .modules.entry_manager import LastEntriesManager, LastPublishDateManager
+from .profiler import Profiler
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG if DEBUG else logging.INFO)
@@ -18,8 +20,10 @@ class WorkerManager:
         handle_entry: callable,
         get_entries: callable,
         entries_manager: Union[LastEntriesManager, LastPublishDateManager],
+        profiler: Optional[Profiler] = None,
     ) -> None:
         self.em = entries_manager
+        self.profiler = profiler
         self.handle_entry = handle_entry
         self.get_entries = get_entries
         self.queue = LifoQueue()
@@ -28,9 +32,15 @@ class WorkerManager:
         self.__failed = 0
         self._lock = Lock()
 
+    def profile(self, label, exclusive=False):
+        if self.profiler:
+            return self.profiler.task(label, exclusive=exclusive)
+        return nullcontext()
+
     def update_entries(self):
-        entries = self.get_entries()
-        self.em.feed_new_entries(entries)
+        with self.profile("feed", exclusive=True):
+            entries = self.get_entries()
+            self.em.feed_new_entries(entries)
 
     def __get_current(self):
         with self._lock:
@@ -47,12 +57,13 @@ class WorkerManager:
             entry = self.queue.get()
             tag = f"[{self.__get_current()}/{self.total}]"
             try:
-                result = self.handle_entry(entry=entry, tag=tag)
-                if result:
-                    self.em.set_success(entry.id)
-                else:
-                    self.em.set_failed(entry.id)
-                    self.__increase_failed()
+                with self.profile(entry.id):
+                    result = self.handle_entry(entry=entry, tag=tag)
+                    if result:
+                        self.em.set_success(entry.id)
+                    else:
+                        self.em.set_failed(entry.id)
+                        self.__increase_failed()
                 log.debug(f"{tag} Task completed")
             except Exception:
                 log.error(format_exc())